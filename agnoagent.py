@@ -1,10 +1,16 @@
 import asyncio
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional
-import io
-from contextlib import redirect_stdout
-from datetime import datetime
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import time
+import hashlib
+import re
+from collections import OrderedDict
 from agno.agent import Agent
 from agno.models.google import Gemini
 from agno.tools.mcp import MCPTools
@@ -13,34 +19,353 @@ from agno.storage.sqlite import SqliteStorage
 from agno.memory.v2.db.sqlite import SqliteMemoryDb
 from agno.memory.v2.memory import Memory
 from agno.memory.v2.manager import MemoryManager
+from agno.memory.v2.summarizer import SessionSummarizer
+from agno.memory.v2.schema import SessionSummary, UserMemory
+from agno.models.message import Message
+from agno.run.response import RunResponse, RunStatus
+from datetime import datetime
+from sqlalchemy import event, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+import threading
+import copy
+import contextvars
+import uuid
+from contextlib import contextmanager
 import os
 
+# Log records are queued and written to stderr by a background
+# listener thread, so handlers never block on stdout
+log_queue = queue.SimpleQueue()
+log_output = logging.StreamHandler()
+log_output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_listener = QueueListener(log_queue, log_output)
+log_listener.start()
+atexit.register(log_listener.stop)
+# The listener's handler does the real formatting; keep basicConfig from
+# installing its own format on the queue side
+log_enqueue = QueueHandler(log_queue)
+log_enqueue.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), handlers=[log_enqueue])
+logger = logging.getLogger("agnoagent")
+
 os.makedirs("tmp", exist_ok=True)
 
 agent_storage = SqliteStorage(
     table_name="agent_sessions", 
     db_file="tmp/persistent_memory.db"
 )
-memory_db = SqliteMemoryDb(
+class BatchedSqliteMemoryDb(SqliteMemoryDb):
+    """SqliteMemoryDb that can coalesce upserts into a single transaction.
+
+    Inside batch(), upsert_memory only queues rows for the calling thread.
+    They are written with one executemany INSERT ... ON CONFLICT and one
+    commit when the batch ends, or earlier if this thread reads or deletes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    @contextmanager
+    def batch(self):
+        self._local.pending = []
+        try:
+            yield self
+            self._flush()
+        finally:
+            self._local.pending = None
+
+    def upsert_memory(self, memory, create_and_retry: bool = True) -> None:
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            return super().upsert_memory(memory, create_and_retry=create_and_retry)
+        pending.append(memory)
+
+    def read_memories(self, *args, **kwargs):
+        self._flush()
+        return super().read_memories(*args, **kwargs)
+
+    def delete_memory(self, memory_id: str) -> None:
+        self._flush()
+        super().delete_memory(memory_id)
+
+    def clear(self) -> bool:
+        self._flush()
+        return super().clear()
+
+    def _flush(self, create_and_retry: bool = True) -> None:
+        pending = getattr(self._local, "pending", None)
+        if not pending:
+            return
+        rows = [{"id": m.id, "user_id": m.user_id, "memory": str(m.memory)} for m in pending]
+        stmt = sqlite_insert(self.table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.table.c.id],
+            set_={
+                "user_id": stmt.excluded.user_id,
+                "memory": stmt.excluded.memory,
+                "updated_at": text("CURRENT_TIMESTAMP"),
+            },
+        )
+        try:
+            with self.Session() as session:
+                session.execute(stmt, rows)
+                session.commit()
+        except SQLAlchemyError:
+            if self.table_exists() or not create_and_retry:
+                raise
+            self.create()
+            return self._flush(create_and_retry=False)
+        pending.clear()
+
+memory_db = BatchedSqliteMemoryDb(
     table_name="memory", 
     db_file="tmp/memory.db"
 )
 
+# SQLite tuning applied to every connection opened on the file-backed DBs.
+# WAL lets the memory manager write while other requests keep reading.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+def _tune_sqlite(conn):
+    """Apply WAL journaling and tuned PRAGMAs to a raw sqlite3 connection"""
+    cursor = conn.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+def tune_sqlite_db(db):
+    """Register _tune_sqlite on the SQLAlchemy engine behind an agno SQLite DB"""
+    # SqliteStorage keeps no db_file attribute, so read the path off the engine
+    db_path = db.db_engine.url.database
+    if not db_path or db_path == ":memory:":
+        return
+    event.listen(db.db_engine, "connect", lambda conn, _record: _tune_sqlite(conn))
+    # Drop any connection pooled before the listener existed
+    db.db_engine.dispose()
+
+tune_sqlite_db(agent_storage)
+tune_sqlite_db(memory_db)
+# Create the memory table up front; agno creates it lazily on first read,
+# which races when several captures start in worker threads at once
+memory_db.create()
+
 # Configuration
 SERVER_URL = "http://localhost:3001/mcp"
 GEMINI_API_KEY = ""
+# Cheaper model for memory bookkeeping; the agent itself stays on pro
+MEMORY_MODEL_ID = "gemini-1.5-flash-002"
 
 # FastAPI app instance
-app = FastAPI(title="Agent API", description="API for MCP Agent interactions")
+app = FastAPI(
+    title="Agent API",
+    description="API for MCP Agent interactions",
+    default_response_class=ORJSONResponse
+)
+
+class ThreadedMemory(Memory):
+    """Memory whose capture step runs in a worker thread.
+
+    SqliteMemoryDb is synchronous, and agno calls it straight from
+    acreate_user_memories (reads before and after, one upsert per captured
+    memory), which blocks the event loop. Running the synchronous
+    create_user_memories in a thread keeps that I/O off the loop.
+
+    Concurrent captures each run on their own IsolatedMemoryManager copy,
+    and refresh_from_db publishes reloaded memories in one assignment so
+    the event loop never reads a half-filled dict while building a prompt.
+    """
+
+    async def acreate_user_memories(self, message=None, messages=None, user_id=None, refresh_from_db=True) -> str:
+        return await asyncio.to_thread(
+            self._create_user_memories_batched,
+            message=message,
+            messages=messages,
+            user_id=user_id,
+            refresh_from_db=refresh_from_db,
+        )
+
+    def _create_user_memories_batched(self, **kwargs) -> str:
+        # Coalesce this turn's upserts into one transaction
+        with self.db.batch():
+            return self.create_user_memories(**kwargs)
+
+    def refresh_from_db(self, user_id: Optional[str] = None):
+        if self.db:
+            if user_id is None:
+                all_memories = self.db.read_memories()
+            else:
+                all_memories = self.db.read_memories(user_id=user_id)
+            memories = {}
+            for memory in all_memories:
+                if memory.user_id is not None and memory.id is not None:
+                    memories.setdefault(memory.user_id, {})[memory.id] = UserMemory.from_dict(memory.memory)
+            self.memories = memories
+
+class IsolatedMemoryManager(MemoryManager):
+    """MemoryManager that is safe to call from several threads at once.
+
+    create_or_update_memories stores the per-user tool closures on the
+    instance (determine_tools_for_model) and reads them back for the model
+    call, so each capture runs on a shallow copy instead of shared state.
+    """
 
-memory = Memory(
+    def create_or_update_memories(self, *args, **kwargs) -> str:
+        manager = copy.copy(self)
+        response = MemoryManager.create_or_update_memories(manager, *args, **kwargs)
+        if manager.memories_updated:
+            self.memories_updated = True
+        return response
+
+# Approximate token cap on raw history spliced into each prompt; older
+# context reaches the model through the session summary instead
+HISTORY_TOKEN_BUDGET = 1000
+
+def _estimate_tokens(message) -> int:
+    """Rough token count for a history message (~4 characters per token)"""
+    size = len(message.get_content_string())
+    if message.tool_calls:
+        size += len(str(message.tool_calls))
+    return size // 4 + 1
+
+# Shortest a tool result is cut to when the latest turn alone is over budget
+MIN_TOOL_RESULT_CHARS = 200
+
+def _truncate_tool_results(messages: list, sizes: list, total: int) -> list:
+    """Shrink tool results in place of dropping the turn that needs them"""
+    tool_indexes = [i for i, m in enumerate(messages) if m.role == "tool"]
+    if not tool_indexes:
+        return messages
+    other_tokens = total - sum(sizes[i] for i in tool_indexes)
+    limit = max(MIN_TOOL_RESULT_CHARS, (HISTORY_TOKEN_BUDGET - other_tokens) * 4 // len(tool_indexes))
+    messages = list(messages)
+    for i in tool_indexes:
+        content = messages[i].get_content_string()
+        if len(content) > limit:
+            # Copy so the stored run keeps the full result
+            messages[i] = messages[i].model_copy(update={"content": content[:limit] + " …[truncated]"})
+    return messages
+
+# Run this request just added to memory; agno summarizes right after adding
+# it, and the gathered summary task inherits the request's context
+_finished_run = contextvars.ContextVar("finished_run", default=None)
+# Summary updates redone when a concurrent turn replaced the summary meanwhile
+SUMMARY_MERGE_ATTEMPTS = 3
+
+class BudgetedMemory(ThreadedMemory):
+    """Memory that trims replayed history to HISTORY_TOKEN_BUDGET.
+
+    Session summaries are updated incrementally: agno re-summarizes every
+    run of the session each turn, and the agent shares one session, so the
+    summarizer only sees the previous summary plus the run that just
+    finished for this request.
+    """
+
+    def add_run(self, session_id: str, run) -> None:
+        super().add_run(session_id=session_id, run=run)
+        _finished_run.set(run)
+
+    def _summary_run(self, session_id: str):
+        run = _finished_run.get()
+        if run is None:
+            # Not called from a request's run (e.g. agno's threaded sync path)
+            runs = (self.runs or {}).get(session_id)
+            run = runs[-1] if runs else None
+        return run
+
+    def _summary_conversation(self, previous, run) -> list:
+        # The summarizer only reads user/assistant text, so tool payloads,
+        # system prompts and replayed history are left out rather than trimmed
+        messages = [
+            m for m in (run.messages or [])
+            if m.role in ("user", "assistant") and m.content and not m.from_history
+        ]
+        if previous is not None:
+            messages = [Message(role="assistant", content=f"Summary of the earlier conversation: {previous.summary}")] + messages
+        return messages
+
+    def _current_summary(self, session_id: str, user_id: str):
+        return (self.summaries or {}).get(user_id, {}).get(session_id)
+
+    def _store_summary(self, session_id: str, user_id: str, summary_response):
+        if summary_response is None:
+            return None
+        session_summary = SessionSummary(
+            summary=summary_response.summary, topics=summary_response.topics, last_updated=datetime.now()
+        )
+        self.summaries.setdefault(user_id, {})[session_id] = session_summary
+        return session_summary
+
+    def create_session_summary(self, session_id: str, user_id: Optional[str] = None):
+        if not self.summary_manager:
+            raise ValueError("Summarizer not initialized")
+        user_id = user_id or "default"
+        run = self._summary_run(session_id)
+        if run is None:
+            return None
+        for _ in range(SUMMARY_MERGE_ATTEMPTS):
+            previous = self._current_summary(session_id, user_id)
+            summary_response = self.summary_manager.run(conversation=self._summary_conversation(previous, run))
+            if summary_response is None or self._current_summary(session_id, user_id) is previous:
+                break
+        return self._store_summary(session_id, user_id, summary_response)
+
+    async def acreate_session_summary(self, session_id: str, user_id: Optional[str] = None):
+        if not self.summary_manager:
+            raise ValueError("Summarizer not initialized")
+        user_id = user_id or "default"
+        run = self._summary_run(session_id)
+        if run is None:
+            return None
+        for _ in range(SUMMARY_MERGE_ATTEMPTS):
+            previous = self._current_summary(session_id, user_id)
+            summary_response = await self.summary_manager.arun(conversation=self._summary_conversation(previous, run))
+            # Another turn stored a summary meanwhile: fold this run into that one instead
+            if summary_response is None or self._current_summary(session_id, user_id) is previous:
+                break
+        return self._store_summary(session_id, user_id, summary_response)
+
+    def get_messages_from_last_n_runs(self, *args, **kwargs):
+        messages = super().get_messages_from_last_n_runs(*args, **kwargs)
+        sizes = [_estimate_tokens(m) for m in messages]
+        total = sum(sizes)
+        # The latest turn is always kept; follow-ups like "book the second one" need it
+        last_turn = max((i for i, m in enumerate(messages) if m.role == "user"), default=0)
+        start = 0
+        while total > HISTORY_TOKEN_BUDGET and start < last_turn:
+            # Drop whole turns so tool calls never lose their results
+            total -= sizes[start]
+            start += 1
+            while start < last_turn and messages[start].role != "user":
+                total -= sizes[start]
+                start += 1
+        if total > HISTORY_TOKEN_BUDGET:
+            return _truncate_tool_results(messages[start:], sizes[start:], total)
+        return messages[start:]
+
+memory = BudgetedMemory(
     db=memory_db,
-    memory_manager=MemoryManager(
+    memory_manager=IsolatedMemoryManager(
         memory_capture_instructions="""\
             Maintain conversation context and history
         """,
         model=Gemini(
-            id="gemini-1.5-pro-002",
+            id=MEMORY_MODEL_ID,
+            api_key=GEMINI_API_KEY
+        ),
+    ),
+    summarizer=SessionSummarizer(
+        model=Gemini(
+            id=MEMORY_MODEL_ID,
             api_key=GEMINI_API_KEY
         ),
     ),
@@ -49,6 +374,9 @@ memory = Memory(
 # Request model
 class PromptRequest(BaseModel):
     message: str
+    # Sent by the Slack bot; without them, message is used as the full prompt
+    username: Optional[str] = None
+    display_name: Optional[str] = None
 
 # Response model
 class AgentResponse(BaseModel):
@@ -57,15 +385,89 @@ class AgentResponse(BaseModel):
     error: Optional[str] = None
 
 # Custom datetime tool
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S (%A)"
+
+# (epoch second, formatted string); swapped as one tuple so readers never see a torn pair
+_datetime_cache = (0, "")
+
 def get_current_datetime() -> str:
     """Get the current date and time in a readable format"""
-    now = datetime.now()
-    return now.strftime("%Y-%m-%d %H:%M:%S (%A)")
+    global _datetime_cache
+    now = int(time.time())
+    second, formatted = _datetime_cache
+    if second != now:
+        formatted = time.strftime(DATETIME_FORMAT, time.localtime(now))
+        _datetime_cache = (now, formatted)
+    return formatted
 
 # Create toolkit with datetime tool
 datetime_toolkit = Toolkit()
 datetime_toolkit.register(get_current_datetime)
 
+# Agent instructions, built once at import
+INSTRUCTIONS = (
+    "You are a meeting room booking agent.these are the room names with their room ids [denali:4, cherry blossom:5, donee:1, some room:2, lilac:3, Peony:6] there could be some typo find the best matching room from this list",
+    "IMPORTANT: Always check the current date and time first using get_current_datetime() before processing any booking request.",
+    "You can only book meetings for future dates and times. Do not allow bookings for past dates or times.",
+    "If no date is specified, use today's date but ensure the time is in the future.",
+    "If a user tries to book a meeting in the past, politely decline and suggest future time slots.",
+    "always reply with the username like hi <username> and then reply message",
+    "When processing booking requests,always make a tool call to check the booked slots of that particular room to make sure the current booking time doesnt conflict with previous bookings and validate that the requested date/time is after the current date/time and always ask for name if not provided. make sure to do with least tool calls",
+)
+
+# Short-lived cache of replies to repeated read-only queries:
+# (username, sha1(normalized text)) -> (expires_at, response)
+response_cache = OrderedDict()
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL = 60  # seconds
+PROMPT_TEMPLATE = "Username is: {}, Display name is: {}, User message is: {}"
+# Legacy clients send the prompt already formatted with PROMPT_TEMPLATE
+_PROMPT_RE = re.compile(r"^Username is: (.*?), Display name is: .*?, User message is: (.*)$", re.DOTALL)
+# Requests or replies touching bookings (or short context-dependent answers) are never replayed.
+# A replayed reply is still recorded as a run (see _record_cached_turn) so a
+# follow-up like "book it" sees the answer the user was actually shown.
+_MUTATING_RE = re.compile(r"\b(?:book\w*|reserv\w*|cancel\w*|confirm\w*|yes|no)\b", re.IGNORECASE)
+
+def build_prompt(request: PromptRequest) -> str:
+    """Format the agent prompt from the request fields"""
+    if request.username is None:
+        return request.message
+    return PROMPT_TEMPLATE.format(request.username, request.display_name or request.username, request.message)
+
+def _response_cache_key(request: PromptRequest) -> tuple:
+    """Key a prompt by user and normalized message text"""
+    if request.username is not None:
+        username, text = request.username, request.message
+    else:
+        match = _PROMPT_RE.match(request.message)
+        username, text = match.groups() if match else ("", request.message)
+    return username, hashlib.sha1(text.lower().strip().encode()).hexdigest()
+
+def _cache_response(cache_key: tuple, message: str, response: str):
+    """Remember a reply unless the exchange could have changed state"""
+    if not response or _MUTATING_RE.search(message) or _MUTATING_RE.search(response):
+        return
+    response_cache[cache_key] = (time.monotonic() + RESPONSE_CACHE_TTL, response)
+    response_cache.move_to_end(cache_key)
+    while len(response_cache) > RESPONSE_CACHE_SIZE:
+        response_cache.popitem(last=False)
+
+def _record_cached_turn(message: str, response: str):
+    """Add a cache-served exchange to the agent's history like a real run"""
+    if agent is None or agent.session_id is None:
+        return
+    memory.add_run(
+        session_id=agent.session_id,
+        run=RunResponse(
+            run_id=str(uuid.uuid4()),
+            agent_id=agent.agent_id,
+            session_id=agent.session_id,
+            content=response,
+            messages=[Message(role="user", content=message), Message(role="assistant", content=response)],
+            status=RunStatus.completed,
+        ),
+    )
+
 # Global agent instance - will be initialized on startup
 agent = None
 mcp_tools = None
@@ -75,7 +477,7 @@ async def initialize_agent():
     global agent, mcp_tools
     
     try:
-        print("🔄 Initializing MCP tools and agent...")
+        logger.info("🔄 Initializing MCP tools and agent...")
         
         # Initialize MCP tools connection
         mcp_tools = MCPTools(transport="streamable-http", url=SERVER_URL)
@@ -92,23 +494,16 @@ async def initialize_agent():
             markdown=False,
             memory=memory,
             add_history_to_messages=True,
-            num_history_responses=3,
+            num_history_responses=1,
             enable_user_memories=True,
-            instructions=[
-                "You are a meeting room booking agent.these are the room names with their room ids [denali:4, cherry blossom:5, donee:1, some room:2, lilac:3, Peony:6] there could be some typo find the best matching room from this list",
-                "IMPORTANT: Always check the current date and time first using get_current_datetime() before processing any booking request.",
-                "You can only book meetings for future dates and times. Do not allow bookings for past dates or times.",
-                "If no date is specified, use today's date but ensure the time is in the future.",
-                "If a user tries to book a meeting in the past, politely decline and suggest future time slots.",
-                "always reply with the username like hi <username> and then reply message",
-                "When processing booking requests,always make a tool call to check the booked slots of that particular room to make sure the current booking time doesnt conflict with previous bookings and validate that the requested date/time is after the current date/time and always ask for name if not provided. make sure to do with least tool calls"
-            ]
+            enable_session_summaries=True,
+            instructions=list(INSTRUCTIONS)
         )
         
-        print("✅ Agent and MCP tools initialized successfully!")
+        logger.info("✅ Agent and MCP tools initialized successfully!")
         
     except Exception as e:
-        print(f"❌ Failed to initialize agent: {e}")
+        logger.error("❌ Failed to initialize agent: %s", e)
         raise e
 
 async def cleanup_agent():
@@ -118,11 +513,11 @@ async def cleanup_agent():
     try:
         if mcp_tools:
             await mcp_tools.__aexit__(None, None, None)  # Manually exit the context
-            print("✅ MCP tools cleaned up successfully!")
+            logger.info("✅ MCP tools cleaned up successfully!")
     except Exception as e:
-        print(f"❌ Error during cleanup: {e}")
+        logger.error("❌ Error during cleanup: %s", e)
 
-async def run_agent(message: str) -> str:
+async def run_agent(request: PromptRequest) -> str:
     """Run agent with the persistent agent instance"""
     global agent
     
@@ -130,44 +525,36 @@ async def run_agent(message: str) -> str:
         raise HTTPException(status_code=500, detail="Agent not initialized")
     
     try:
-        print(f"\n=== AGENT REQUEST ===")
-        print(f"Message: {message}")
+        message = build_prompt(request)
+        logger.debug("=== AGENT REQUEST === Message: %s", message)
         
-        # Capture output
-        output_buffer = io.StringIO()
+        # Serve repeats of a recent read-only query without calling the LLM
+        cache_key = _response_cache_key(request)
+        cached = response_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            logger.debug("♻️ Serving cached response")
+            _record_cached_turn(message, cached[1])
+            return cached[1]
         
-        # Use the persistent agent instance
-        print("🔄 Calling agent.arun()...")
-        try:
-            response_obj = await agent.arun(message=message)
-            print(f"✅ Got response object: {type(response_obj)}")
-            
-            # Extract the actual content from the response object
-            if hasattr(response_obj, 'content'):
-                raw_response = str(response_obj.content)
-            elif hasattr(response_obj, 'text'):
-                raw_response = str(response_obj.text)
-            else:
-                raw_response = str(response_obj)
-                
-        except Exception as e:
-            print(f"❌ arun() failed: {e}")
-            print("🔄 Trying aprint_response() fallback...")
-            
-            # Fallback to aprint_response with output capture
-            with redirect_stdout(output_buffer):
-                await agent.aprint_response(message=message, stream=False, markdown=False)
-            
-            raw_response = output_buffer.getvalue()
+        # Use the persistent agent instance; failures surface as a 500 below
+        response_obj = await agent.arun(message=message)
+        logger.debug("✅ Got response object: %s", type(response_obj))
+        
+        # Extract the actual content from the response object
+        if hasattr(response_obj, 'content'):
+            raw_response = str(response_obj.content)
+        elif hasattr(response_obj, 'text'):
+            raw_response = str(response_obj.text)
+        else:
+            raw_response = str(response_obj)
         
-        print(f"\n=== RESPONSE ===")
-        print(raw_response)
-        print(f"=== END RESPONSE ===\n")
+        logger.debug("=== RESPONSE === %s", raw_response)
         
+        _cache_response(cache_key, request.message, raw_response)
         return raw_response
         
     except Exception as e:
-        print(f"ERROR in run_agent: {str(e)}")
+        logger.error("ERROR in run_agent: %s", e)
         raise HTTPException(status_code=500, detail=f"Agent error: {str(e)}")
 
 # FastAPI event handlers
@@ -187,16 +574,15 @@ async def process_agent_request(request: PromptRequest):
     Process a message through the agent and return the response.
     
     - **message**: The prompt/message to send to the agent
+    - **username** / **display_name**: Optional sender names, added to the prompt
     """
     try:
-        print(f"\n🚀 Processing request: {request.message}")
+        logger.info("🚀 Processing request: %s", request.message)
         
-        response = await run_agent(request.message)
+        response = await run_agent(request)
         cleaned_response = response.strip()
         
-        print(f"\n=== FINAL RESPONSE ===")
-        print(cleaned_response)
-        print(f"=== END FINAL RESPONSE ===\n")
+        logger.debug("=== FINAL RESPONSE === %s", cleaned_response)
         
         return AgentResponse(
             response=cleaned_response,
@@ -206,7 +592,7 @@ async def process_agent_request(request: PromptRequest):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ ERROR in process_agent_request: {str(e)}")
+        logger.error("❌ ERROR in process_agent_request: %s", e)
         return AgentResponse(
             response="",
             success=False,
@@ -237,23 +623,23 @@ async def process_simple_request(request: PromptRequest):
     Simplified endpoint that returns just the agent response as plain text.
     """
     try:
-        print(f"\n📝 Simple request: {request.message}")
+        logger.info("📝 Simple request: %s", request.message)
         
-        response = await run_agent(request.message)
+        response = await run_agent(request)
         cleaned_response = response.strip()
         
         return {"response": cleaned_response}
         
     except Exception as e:
-        print(f"❌ ERROR in process_simple_request: {str(e)}")
+        logger.error("❌ ERROR in process_simple_request: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
     
-    print("🎯 Starting FastAPI Agent Server with Google Gemini...")
-    print(f"Server URL: {SERVER_URL}")
-    print(f"Model: gemini-1.5-pro-002")
+    logger.info("🎯 Starting FastAPI Agent Server with Google Gemini...")
+    logger.info("Server URL: %s", SERVER_URL)
+    logger.info("Model: gemini-1.5-pro-002")
     
     # Run the FastAPI server
     uvicorn.run(
@@ -261,5 +647,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=False,
-        workers=1
+        workers=1,
+        loop="uvloop",
+        http="httptools",
+        access_log=False
     )
\ No newline at end of file
@@ -1,84 +1,189 @@
 import os
 import asyncio
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import aiohttp
-import uuid
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
 from dotenv import load_dotenv
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import uvicorn
-import json
-import hashlib
+import orjson
+import xxhash
+import re
+import heapq
+from collections import OrderedDict
+from itertools import count
+import redis.asyncio as redis
 
 load_dotenv()
 
+# Log records are queued by the event loop thread and written by a background
+# listener thread, so handlers never block on stdout
+log_queue = queue.SimpleQueue()
+log_output = logging.StreamHandler()
+log_output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_listener = QueueListener(log_queue, log_output)
+log_listener.start()
+atexit.register(log_listener.stop)
+# The listener's handler does the real formatting; keep basicConfig from
+# installing its own format on the queue side
+log_enqueue = QueueHandler(log_queue)
+log_enqueue.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), handlers=[log_enqueue])
+logger = logging.getLogger("slackbot")
+
 # IMPORTANT: Fix the token assignment
 # Bot tokens start with "xoxb-", signing secrets are shorter hex strings
 SLACK_BOT_TOKEN = ""
 SLACK_SIGNING_SECRET =  " "
 MCP_URL = "http://localhost:8000/agent"
+MCP_HEADERS = {"Content-Type": "application/json"}
+# Shared dedup store; required when running more than one worker
+REDIS_URL = os.getenv("REDIS_URL")
+BOT_WORKERS = int(os.getenv("BOT_WORKERS", max(2, os.cpu_count() or 1) if REDIS_URL else 1))
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Slack Bot API",
     description="Production-ready Slack bot with response deduplication",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Store processed events to prevent duplicates
-processed_events = set()
+# Store processed events to prevent duplicates: event_key -> first seen (monotonic),
+# kept in first-seen order so both expiry and overflow eviction pop from the front
+processed_events: "OrderedDict[str, float]" = OrderedDict()
 MAX_CACHE_SIZE = 1000
+EVENT_DEDUP_TTL = 3600  # 1 hour, same window for the local and Redis stores
 
-# Store sent responses to prevent duplicate responses
-sent_responses = {}
+# Store sent responses to prevent duplicate responses (LRU, key tuple -> sent_at)
+sent_responses = OrderedDict()
 RESPONSE_CACHE_TTL = 600  # 10 minutes
+RESPONSE_DEDUP_WINDOW = 30  # Don't send the same response twice within this many seconds
+REDIS_MAX_CONNECTIONS = 32
+# Min-heap of (expires_at, response_key); stale entries are skipped on pop
+response_expiry = []
+
+# Running mention tasks; the event loop only keeps weak references, so hold
+# them here until done (event dedup already stops double processing)
+mention_tasks = set()
+
+# Request ids for log correlation; the pid prefix keeps them unique across workers
+_PID_HEX = format(os.getpid() & 0xffff, '04x')
+_rid = count()
+
+def next_rid() -> str:
+    return f"{_PID_HEX}{next(_rid):06x}"
+
+# Cap concurrent MCP/LLM calls; extra mentions wait for a free slot
+MAX_CONCURRENT_MENTIONS = 8
+MCP_MAX_CONNECTIONS = 16
+# Fail fast when the agent server is unreachable, but leave the LLM time to answer
+MCP_TIMEOUT = aiohttp.ClientTimeout(total=20, connect=5, sock_connect=2, sock_read=18)
 
-# Track processing tasks
-processing_tasks = {}
+# Reply for mentions that carry no request
+HELP_MESSAGE = (
+    "👋 Tell me what you need, for example:\n"
+    "• `@bot book denali tomorrow 2pm to 4pm for John`\n"
+    "• `@bot is lilac available today 10am?`"
+)
+
+# Fixed user-facing replies
+INITIAL_MESSAGE = "🤔 Processing your request... please hold on a moment."
+DEFAULT_SUCCESS_MESSAGE = "✅ Request processed successfully"
+ERROR_MCP = "Sorry, I couldn't process the request at the moment."
+ERROR_TIMEOUT = "Sorry, the request timed out. Please try again."
+ERROR_CONNECT = "Sorry, I couldn't connect to the processing server."
+ERROR_UNEXPECTED = "Sorry, an unexpected error occurred."
+
+# Leading <@U123> / <@U123|name> mention tokens, stripped before the LLM sees the text
+_MENTION_RE = re.compile(r"^(?:<@[UW][A-Z0-9]+(?:\|[^>]*)?>\s*)+")
+
+# Cache Slack user lookups (LRU): user_id -> (expires_at, (username, display_name) or None)
+user_cache = OrderedDict()
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 3600  # 1 hour; names rarely change
+USER_CACHE_NEGATIVE_TTL = 60  # Retry failed lookups sooner
 
 # Initialize Slack app with async support
 try:
     slack_app = AsyncApp(
         token=SLACK_BOT_TOKEN,
         signing_secret=SLACK_SIGNING_SECRET,
-        process_before_response=True
+        # Ack events right away and run listeners afterwards, so Slack's 3s
+        # deadline never waits on dedup lookups or the help reply
+        process_before_response=False
     )
-    print("✅ Slack app initialized successfully")
-    print(f"Bot token starts with: {SLACK_BOT_TOKEN[:10]}...")
-    print(f"Signing secret length: {len(SLACK_SIGNING_SECRET)}")
+    logger.info("✅ Slack app initialized successfully")
+    logger.info("Bot token starts with: %s...", SLACK_BOT_TOKEN[:10])
+    logger.info("Signing secret length: %d", len(SLACK_SIGNING_SECRET))
 except Exception as e:
-    print(f"❌ Failed to initialize Slack app: {e}")
-    print("Token format check:")
-    print(f"  Bot token starts with 'xoxb-': {SLACK_BOT_TOKEN.startswith('xoxb-')}")
-    print(f"  Signing secret length: {len(SLACK_SIGNING_SECRET)} (should be 32)")
+    logger.error("❌ Failed to initialize Slack app: %s", e)
+    logger.error("Token format check:")
+    logger.error("  Bot token starts with 'xoxb-': %s", SLACK_BOT_TOKEN.startswith('xoxb-'))
+    logger.error("  Signing secret length: %d (should be 32)", len(SLACK_SIGNING_SECRET))
     exit(1)
 
 # Initialize async request handler
 handler = AsyncSlackRequestHandler(slack_app)
 
-def create_response_key(event_data: dict, response_text: str) -> str:
+@app.on_event("startup")
+async def startup_event():
+    """Create the shared HTTP sessions and concurrency limit for outgoing requests"""
+    app.state.http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=MCP_MAX_CONNECTIONS, ttl_dns_cache=300, keepalive_timeout=60),
+        timeout=MCP_TIMEOUT
+    )
+    app.state.mention_semaphore = asyncio.Semaphore(MAX_CONCURRENT_MENTIONS)
+    # A blocking pool makes bursts wait for a free connection instead of opening more
+    app.state.redis = redis.Redis.from_pool(
+        redis.BlockingConnectionPool.from_url(REDIS_URL, max_connections=REDIS_MAX_CONNECTIONS, timeout=2)
+    ) if REDIS_URL else None
+    # slack_sdk opens a new ClientSession per Web API call unless given one;
+    # Bolt passes this session on to every per-request client it builds
+    app.state.slack_http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, use_dns_cache=True, ttl_dns_cache=300, keepalive_timeout=60)
+    )
+    slack_app.client.session = app.state.slack_http
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared HTTP sessions and Redis connection"""
+    await app.state.http.close()
+    await app.state.slack_http.close()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
+
+def create_response_key(event_data: dict, response_text: str) -> tuple:
     """Create a unique key for response deduplication"""
-    event_ts = event_data.get("ts", "")
-    channel = event_data.get("channel", "")
-    user = event_data.get("user", "")
-    # Include hash of response to make key unique per response
-    response_hash = hashlib.md5(response_text.encode()).hexdigest()[:8]
-    return f"{event_ts}_{channel}_{user}_{response_hash}"
+    # Tuples hash natively, so no string formatting is needed for the dict key;
+    # the response hash makes the key unique per response
+    return (
+        event_data.get("ts", ""),
+        event_data.get("channel", ""),
+        event_data.get("user", ""),
+        xxhash.xxh3_64_intdigest(response_text.encode()),
+    )
 
 def clean_old_responses():
     """Clean up old response cache entries"""
     current_time = time.time()
-    expired_keys = [
-        key for key, timestamp in sent_responses.items() 
-        if current_time - timestamp > RESPONSE_CACHE_TTL
-    ]
-    for key in expired_keys:
-        del sent_responses[key]
-    if expired_keys:
-        print(f"🧹 Cleaned {len(expired_keys)} old response cache entries")
+    cleaned = 0
+    while response_expiry and response_expiry[0][0] <= current_time:
+        _, key = heapq.heappop(response_expiry)
+        # The key may have been re-sent (newer heap entry) or evicted since
+        sent_at = sent_responses.get(key)
+        if sent_at is not None and current_time - sent_at >= RESPONSE_CACHE_TTL:
+            del sent_responses[key]
+            cleaned += 1
+    if cleaned:
+        logger.debug("🧹 Cleaned %d old response cache entries", cleaned)
 
 async def safe_say(say_func, message: str, event_data: dict, request_id: str) -> bool:
     """Safely send message to Slack with deduplication"""
@@ -86,275 +191,291 @@ async def safe_say(say_func, message: str, event_data: dict, request_id: str) ->
         response_key = create_response_key(event_data, message)
         current_time = time.time()
         
+        # With Redis, claim the response with SET NX so only one worker sends it
+        redis_key = None
+        if app.state.redis is not None:
+            redis_key = "slack:resp:{}_{}_{}_{:x}".format(*response_key)
+            try:
+                if not await app.state.redis.set(redis_key, 1, nx=True, ex=RESPONSE_DEDUP_WINDOW):
+                    logger.info("[%s] 🚫 BLOCKING duplicate response (sent within %ds)", request_id, RESPONSE_DEDUP_WINDOW)
+                    return False
+            except redis.RedisError as e:
+                logger.warning("[%s] ⚠️ Redis dedup unavailable, using local cache: %s", request_id, e)
+                redis_key = None
+        
         # Check if we've already sent this exact response recently
-        if response_key in sent_responses:
+        if redis_key is None and response_key in sent_responses:
             time_diff = current_time - sent_responses[response_key]
-            if time_diff < 30:  # Don't send same response within 30 seconds
-                print(f"[{request_id}] 🚫 BLOCKING duplicate response (sent {time_diff:.1f}s ago)")
+            if time_diff < RESPONSE_DEDUP_WINDOW:
+                logger.info("[%s] 🚫 BLOCKING duplicate response (sent %.1fs ago)", request_id, time_diff)
                 return False
         
         # Send the message
-        print(f"[{request_id}] 💬 SENDING TO SLACK: {message[:100]}...")
-        await say_func(message)
+        logger.debug("[%s] 💬 SENDING TO SLACK: %.100s...", request_id, message)
+        try:
+            await say_func(message)
+        except Exception:
+            # Release the claim so a retry can still send it
+            if redis_key is not None:
+                try:
+                    await app.state.redis.delete(redis_key)
+                except redis.RedisError:
+                    pass
+            raise
         
         # Record that we sent this response
         sent_responses[response_key] = current_time
-        print(f"[{request_id}] ✅ MESSAGE SENT - Cached response key: {response_key}")
+        sent_responses.move_to_end(response_key)
+        heapq.heappush(response_expiry, (current_time + RESPONSE_CACHE_TTL, response_key))
+        logger.debug("[%s] ✅ MESSAGE SENT - Cached response key: %s", request_id, response_key)
         
-        # Clean up old entries periodically
-        if len(sent_responses) > 50:
-            clean_old_responses()
+        # Expire old entries and keep the cache bounded
+        clean_old_responses()
+        while len(sent_responses) > MAX_CACHE_SIZE:
+            sent_responses.popitem(last=False)
         
         return True
         
     except Exception as e:
-        print(f"[{request_id}] ❌ Error sending message to Slack: {e}")
+        logger.error("[%s] ❌ Error sending message to Slack: %s", request_id, e)
         return False
 
-async def process_mention_async(event_data: dict, say_func, client, logger, request_id: str):
-    """Process mention asynchronously with immediate acknowledgment and response update"""
-    initial_message_ts = None
-    channel = event_data.get("channel")
+async def get_user_names(client, user_id: str, request_id: str) -> tuple:
+    """Return (username, display_name) for a Slack user, cached with a TTL"""
+    current_time = time.time()
+    cached = user_cache.get(user_id)
     
-    try:
-        user_id = event_data["user"]
-        text = event_data["text"]
-        
-        # Get user info
+    if cached and cached[0] > current_time:
+        names = cached[1]
+        user_cache.move_to_end(user_id)
+    else:
         try:
             user_info = await client.users_info(user=user_id)
             username = user_info["user"]["name"]
-            display_name = user_info["user"].get("display_name") or username
+            names = (username, user_info["user"].get("display_name") or username)
+            user_cache[user_id] = (current_time + USER_CACHE_TTL, names)
         except Exception as e:
-            logger.warning(f"[{request_id}] Could not get user info: {e}")
-            username = user_id
-            display_name = user_id
-        
-        print(f"[{request_id}] 🤖 Bot mentioned by {username}: {text[:50]}...")
+            logger.warning("[%s] Could not get user info: %s", request_id, e)
+            names = None
+            user_cache[user_id] = (current_time + USER_CACHE_NEGATIVE_TTL, None)
         
-        # STEP 1: Send immediate acknowledgment message
-        initial_message = "🤔 Processing your request... please hold on a moment."
+        # LRU bound: evict the least recently used users
+        user_cache.move_to_end(user_id)
+        while len(user_cache) > USER_CACHE_SIZE:
+            user_cache.popitem(last=False)
+    
+    return names or (user_id, user_id)
+
+async def reply_or_update(client, say_func, channel: str, message_ts, text: str, event_data: dict, request_id: str):
+    """Update the acknowledgment message in place, falling back to a new message"""
+    if message_ts and channel:
+        try:
+            await client.chat_update(channel=channel, ts=message_ts, text=text)
+            logger.debug("[%s] ✅ Updated message with response", request_id)
+            return
+        except Exception as e:
+            logger.warning("[%s] ❌ Failed to update message: %s", request_id, e)
+    try:
+        await safe_say(say_func, text, event_data, request_id)
+    except Exception as e:
+        logger.error("[%s] ❌ Failed to send fallback message: %s", request_id, e)
+
+async def send_acknowledgment(client, say_func, event_data: dict, request_id: str):
+    """Post the "processing" message and return its ts (None if it could not be updated later)"""
+    try:
+        # Use client.chat_postMessage to get the message timestamp for updates
+        initial_response = await client.chat_postMessage(
+            channel=event_data.get("channel"),
+            text=INITIAL_MESSAGE
+        )
+        logger.debug("[%s] ✅ Sent initial message with ts: %s", request_id, initial_response["ts"])
+        return initial_response["ts"]
+    except Exception as e:
+        logger.warning("[%s] ❌ Failed to send initial message: %s", request_id, e)
+        # Fallback to regular say function
         try:
-            # Use client.chat_postMessage to get the message timestamp for updates
-            initial_response = await client.chat_postMessage(
-                channel=channel,
-                text=initial_message
-            )
-            initial_message_ts = initial_response["ts"]
-            print(f"[{request_id}] ✅ Sent initial message with ts: {initial_message_ts}")
+            await safe_say(say_func, INITIAL_MESSAGE, event_data, request_id)
         except Exception as e:
-            print(f"[{request_id}] ❌ Failed to send initial message: {e}")
-            # Fallback to regular say function
-            await safe_say(say_func, initial_message, event_data, request_id)
+            logger.error("[%s] ❌ Failed to send fallback message: %s", request_id, e)
+        return None
+
+async def process_mention_async(event_data: dict, say_func, client, request_id: str):
+    """Process mention asynchronously with immediate acknowledgment and response update"""
+    channel = event_data.get("channel")
+    
+    # STEP 1: Send immediate acknowledgment message; it doesn't depend on the
+    # user lookup or the MCP call, so it runs alongside them
+    ack_task = asyncio.create_task(send_acknowledgment(client, say_func, event_data, request_id))
+    
+    try:
+        user_id = event_data["user"]
+        text = _MENTION_RE.sub("", event_data["text"]).strip()
+        
+        # Get user info
+        username, display_name = await get_user_names(client, user_id, request_id)
+        
+        logger.info("[%s] 🤖 Bot mentioned by %s: %.50s...", request_id, username, text)
         
         # STEP 2: Prepare payload for MCP server
-        enhanced_message = f"Username is: {username}, Display name is: {display_name}, User message is: {text}"
-        payload = {"message": enhanced_message}
+        # The agent server builds the prompt from these fields
+        body_bytes = orjson.dumps({"message": text, "username": username, "display_name": display_name})
         
-        print(f"[{request_id}] 📤 Sending to MCP server...")
+        logger.debug("[%s] 📤 Sending to MCP server...", request_id)
         
         # STEP 3: Make HTTP request to MCP server
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(MCP_URL, json=payload, timeout=30) as response:
-                    print(f"[{request_id}] 📥 MCP Response Status: {response.status}")
-                    
-                    if response.status == 200:
-                        mcp_response = await response.json()
-                        print(f"[{request_id}] MCP Response: {mcp_response}")
-                        
-                        if mcp_response.get("success", False):
-                            reply = mcp_response.get("response", "✅ Request processed successfully")
-                            
-                            # STEP 4: Update the initial message with the actual response
-                            if initial_message_ts:
-                                try:
-                                    await client.chat_update(
-                                        channel=channel,
-                                        ts=initial_message_ts,
-                                        text=reply
-                                    )
-                                    print(f"[{request_id}] ✅ Updated message with actual response")
-                                except Exception as e:
-                                    print(f"[{request_id}] ❌ Failed to update message: {e}")
-                                    # Fallback: send new message
-                                    await safe_say(say_func, reply, event_data, request_id)
-                            else:
-                                await safe_say(say_func, reply, event_data, request_id)
-                        else:
-                            error_msg = mcp_response.get("error", "Unknown error occurred")
-                            print(f"[{request_id}] ❌ MCP server error: {error_msg}")
-                            error_response = "Sorry, I couldn't process the request at the moment."
-                            
-                            if initial_message_ts:
-                                try:
-                                    await client.chat_update(
-                                        channel=channel,
-                                        ts=initial_message_ts,
-                                        text=error_response
-                                    )
-                                except:
-                                    await safe_say(say_func, error_response, event_data, request_id)
-                            else:
-                                await safe_say(say_func, error_response, event_data, request_id)
-                    else:
-                        print(f"[{request_id}] ❌ MCP server returned {response.status}")
-                        error_response = "Sorry, I couldn't process the request at the moment."
-                        
-                        if initial_message_ts:
-                            try:
-                                await client.chat_update(
-                                    channel=channel,
-                                    ts=initial_message_ts,
-                                    text=error_response
-                                )
-                            except:
-                                await safe_say(say_func, error_response, event_data, request_id)
-                        else:
-                            await safe_say(say_func, error_response, event_data, request_id)
-                        
-            except asyncio.TimeoutError:
-                print(f"[{request_id}] ❌ MCP request timeout")
-                timeout_response = "Sorry, the request timed out. Please try again."
+        session = app.state.http
+        try:
+            async with app.state.mention_semaphore, session.post(
+                MCP_URL, data=body_bytes, headers=MCP_HEADERS
+            ) as response:
+                logger.debug("[%s] 📥 MCP Response Status: %s", request_id, response.status)
                 
-                if initial_message_ts:
+                if response.status == 200:
+                    body = await response.read()
                     try:
-                        await client.chat_update(
-                            channel=channel,
-                            ts=initial_message_ts,
-                            text=timeout_response
-                        )
-                    except:
-                        await safe_say(say_func, timeout_response, event_data, request_id)
+                        mcp_response = orjson.loads(body)
+                    except orjson.JSONDecodeError:
+                        # Agent-side breakage; keep the body in the logs rather than relaying it
+                        logger.error("[%s] ❌ MCP server returned non-JSON body: %.200r", request_id, body)
+                        mcp_response = {"success": False, "error": "invalid JSON response"}
+                    logger.debug("[%s] MCP Response: %s", request_id, mcp_response)
+                    
+                    if mcp_response.get("success", False):
+                        reply = mcp_response.get("response", DEFAULT_SUCCESS_MESSAGE)
+                    else:
+                        logger.error("[%s] ❌ MCP server error: %s", request_id,
+                                     mcp_response.get("error", "Unknown error occurred"))
+                        reply = ERROR_MCP
                 else:
-                    await safe_say(say_func, timeout_response, event_data, request_id)
+                    logger.error("[%s] ❌ MCP server returned %s", request_id, response.status)
+                    reply = ERROR_MCP
                     
-            except aiohttp.ClientError as e:
-                print(f"[{request_id}] ❌ MCP request failed: {e}")
-                error_response = "Sorry, I couldn't connect to the processing server."
+        except asyncio.TimeoutError:
+            logger.error("[%s] ❌ MCP request timeout", request_id)
+            reply = ERROR_TIMEOUT
                 
-                if initial_message_ts:
-                    try:
-                        await client.chat_update(
-                            channel=channel,
-                            ts=initial_message_ts,
-                            text=error_response
-                        )
-                    except:
-                        await safe_say(say_func, error_response, event_data, request_id)
-                else:
-                    await safe_say(say_func, error_response, event_data, request_id)
+        except aiohttp.ClientError as e:
+            logger.error("[%s] ❌ MCP request failed: %s", request_id, e)
+            reply = ERROR_CONNECT
+        
+        # STEP 4: Update the initial message with the actual response
+        initial_message_ts = await ack_task
+        await reply_or_update(client, say_func, channel, initial_message_ts, reply, event_data, request_id)
         
-        print(f"[{request_id}] 🏁 Finished processing")
+        logger.info("[%s] 🏁 Finished processing", request_id)
         
     except Exception as e:
-        logger.error(f"[{request_id}] Processing error: {e}")
-        print(f"[{request_id}] ❌ Processing error: {e}")
+        logger.error("[%s] ❌ Processing error: %s", request_id, e)
         
         # Handle errors by updating the initial message if possible
-        error_response = "Sorry, an unexpected error occurred."
-        if initial_message_ts and channel:
-            try:
-                await client.chat_update(
-                    channel=channel,
-                    ts=initial_message_ts,
-                    text=error_response
-                )
-            except:
-                try:
-                    await safe_say(say_func, error_response, event_data, request_id)
-                except:
-                    pass
-        else:
-            try:
-                await safe_say(say_func, error_response, event_data, request_id)
-            except:
-                pass
-    finally:
-        # Clean up tracking
-        event_key = f"{event_data.get('ts')}_{event_data.get('channel')}"
-        processing_tasks.pop(event_key, None)
-
-def create_event_key(event: dict) -> str:
+        initial_message_ts = await ack_task
+        await reply_or_update(client, say_func, channel, initial_message_ts,
+                              ERROR_UNEXPECTED, event_data, request_id)
+
+def create_event_key(event: dict, event_id: Optional[str] = None) -> str:
     """Create a unique key for event deduplication"""
-    event_ts = event.get("ts", "")
-    event_channel = event.get("channel", "")
-    event_user = event.get("user", "")
-    event_text = event.get("text", "")
+    # Slack already assigns unique ids: client_msg_id per message and event_id
+    # per event (kept across retries), so there is no need to hash the text
+    return (
+        event.get("client_msg_id")
+        or event_id
+        or f"{event.get('ts', '')}_{event.get('channel', '')}_{event.get('user', '')}"
+    )
+
+async def is_duplicate_event(event_key: str) -> bool:
+    """Return True if the event was already seen, otherwise record it"""
+    if app.state.redis is not None:
+        try:
+            # SET NX only succeeds for the first worker to see the event
+            first_seen = await app.state.redis.set(f"slack:ev:{event_key}", 1, nx=True, ex=EVENT_DEDUP_TTL)
+            return not first_seen
+        except redis.RedisError as e:
+            logger.warning("⚠️ Redis dedup unavailable, using local cache: %s", e)
+    
+    now = time.monotonic()
+    while processed_events and now - next(iter(processed_events.values())) >= EVENT_DEDUP_TTL:
+        processed_events.popitem(last=False)
     
-    # Create hash of the event content for uniqueness
-    content_hash = hashlib.md5(f"{event_ts}_{event_channel}_{event_user}_{event_text}".encode()).hexdigest()[:8]
-    return f"{event_ts}_{event_channel}_{content_hash}"
+    # Like SET NX, a repeat doesn't extend the entry's lifetime
+    if event_key in processed_events:
+        return True
+    
+    processed_events[event_key] = now
+    while len(processed_events) > MAX_CACHE_SIZE:
+        processed_events.popitem(last=False)
+    return False
 
 # Listen for app mentions
 @slack_app.event("app_mention")
-async def handle_app_mention_events(body: Dict[Any, Any], say, logger, client):
-    request_id = str(uuid.uuid4())[:8]
+async def handle_app_mention_events(body: Dict[Any, Any], say, client):
+    request_id = next_rid()
     
     try:
         event = body.get("event", {})
-        event_key = create_event_key(event)
+        event_key = create_event_key(event, body.get("event_id"))
         
-        print(f"[{request_id}] 🎯 Received app mention - Event: {event_key}")
+        logger.info("[%s] 🎯 Received app mention - Event: %s", request_id, event_key)
         
-        # Check for duplicate events
-        if event_key in processed_events:
-            print(f"[{request_id}] ⏭️  DUPLICATE EVENT BLOCKED: {event_key}")
+        # Check for duplicate events (also marks the event as processed)
+        if await is_duplicate_event(event_key):
+            logger.info("[%s] ⏭️  DUPLICATE EVENT BLOCKED: %s", request_id, event_key)
             return
         
-        # Check if already processing
-        if event_key in processing_tasks:
-            print(f"[{request_id}] ⏭️  Already processing: {event_key}")
+        # Skip mentions with no message before any Slack API call
+        if not _MENTION_RE.sub("", event.get("text", "")).strip():
+            logger.info("[%s] 💤 Empty mention, sending help", request_id)
+            await say(HELP_MESSAGE)
             return
         
-        # Mark as processed and processing
-        processed_events.add(event_key)
-        processing_tasks[event_key] = request_id
-        
-        # Clean up old events
-        if len(processed_events) > MAX_CACHE_SIZE:
-            old_events = list(processed_events)[:MAX_CACHE_SIZE // 2]
-            for old_event in old_events:
-                processed_events.discard(old_event)
-        
-        print(f"[{request_id}] 🚀 Processing new event: {event_key}")
+        logger.debug("[%s] 🚀 Processing new event: %s", request_id, event_key)
         
         # Process asynchronously
-        asyncio.create_task(
-            process_mention_async(event, say, client, logger, request_id)
+        task = asyncio.create_task(
+            process_mention_async(event, say, client, request_id),
+            name=f"mention:{request_id}"
         )
+        mention_tasks.add(task)
+        task.add_done_callback(mention_tasks.discard)
         
     except Exception as e:
-        logger.error(f"[{request_id}] Handler error: {e}")
-        print(f"[{request_id}] ❌ Handler error: {e}")
+        logger.error("[%s] ❌ Handler error: %s", request_id, e)
 
 # FastAPI routes
 @app.post("/slack/events")
 async def slack_events(request: Request):
     """Handle Slack events"""
+    # Retries still go through Bolt: the first delivery may never have been
+    # handled (stuck or restarting worker), and dedup drops it if it was
+    if request.headers.get("X-Slack-Retry-Num"):
+        logger.info("🔁 Slack retry %s (%s)", request.headers["X-Slack-Retry-Num"],
+                    request.headers.get("X-Slack-Retry-Reason"))
+    
     try:
         body = await request.body()
         
-        try:
-            data = json.loads(body)
-            
-            # Handle URL verification
-            if data and data.get("type") == "url_verification":
-                challenge = data.get("challenge")
-                print(f"🔐 URL verification: {challenge}")
-                return PlainTextResponse(challenge)
-            
-            event_type = data.get('event', {}).get('type', 'unknown')
-            event_ts = data.get('event', {}).get('ts', 'no_ts')
-            print(f"📨 Event: {event_type} at {event_ts}")
-            
-        except json.JSONDecodeError:
-            print("📨 Could not parse JSON body")
+        # Only URL verification needs parsing here; Bolt parses event
+        # callbacks itself (Starlette caches the body for it)
+        if b'"url_verification"' in body:
+            try:
+                data = orjson.loads(body)
+                
+                if data and data.get("type") == "url_verification":
+                    challenge = data.get("challenge")
+                    logger.info("🔐 URL verification: %s", challenge)
+                    return PlainTextResponse(challenge)
+                
+            except orjson.JSONDecodeError:
+                logger.warning("📨 Could not parse JSON body")
         
-        return await handler.handle(request)
+        response = await handler.handle(request)
+        # Once an event is acked, tell Slack not to redeliver it; server
+        # errors are left retryable
+        if response.status_code < 500:
+            response.headers["X-Slack-No-Retry"] = "1"
+        return response
         
     except Exception as e:
-        print(f"❌ Slack events error: {e}")
+        logger.error("❌ Slack events error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/health")
@@ -364,33 +485,36 @@ async def health_check():
         "bot_token_valid": SLACK_BOT_TOKEN.startswith("xoxb-"),
         "signing_secret_length": len(SLACK_SIGNING_SECRET),
         "processed_events": len(processed_events),
-        "active_tasks": len(processing_tasks),
-        "cached_responses": len(sent_responses)
+        "active_tasks": len(mention_tasks),
+        "cached_responses": len(sent_responses),
+        "cached_users": len(user_cache)
     }
 
 @app.get("/debug")
 async def debug_info():
     return {
         "processed_events_count": len(processed_events),
-        "processing_tasks": processing_tasks,
+        "processing_tasks": [task.get_name() for task in mention_tasks],
         "sent_responses_count": len(sent_responses),
         "recent_events": list(processed_events)[-5:],
-        "recent_responses": {k: f"{time.time() - v:.1f}s ago" for k, v in list(sent_responses.items())[-3:]}
+        # JSON object keys must be strings, so tuple keys are joined for display
+        "recent_responses": {"_".join(map(str, k)): f"{time.time() - v:.1f}s ago" for k, v in list(sent_responses.items())[-3:]}
     }
 
 @app.post("/clear-cache")
 async def clear_cache():
-    global processed_events, processing_tasks, sent_responses
+    global processed_events, sent_responses, user_cache
     
     counts = {
         "processed_events": len(processed_events),
-        "processing_tasks": len(processing_tasks),
-        "sent_responses": len(sent_responses)
+        "sent_responses": len(sent_responses),
+        "user_cache": len(user_cache)
     }
     
     processed_events.clear()
-    processing_tasks.clear()
     sent_responses.clear()
+    response_expiry.clear()
+    user_cache.clear()
     
     return {"message": "Caches cleared", "cleared_counts": counts}
 
@@ -403,16 +527,19 @@ async def root():
     }
 
 if __name__ == "__main__":
-    print("🚀 Starting Enhanced Slack Bot...")
-    print(f"✅ Bot token format: {'Valid' if SLACK_BOT_TOKEN.startswith('xoxb-') else 'INVALID'}")
-    print(f"✅ Signing secret length: {len(SLACK_SIGNING_SECRET)} ({'Valid' if len(SLACK_SIGNING_SECRET) == 32 else 'Check length'})")
-    print("🛡️  Deduplication: Event + Response")
+    logger.info("🚀 Starting Enhanced Slack Bot...")
+    logger.info("✅ Bot token format: %s", 'Valid' if SLACK_BOT_TOKEN.startswith('xoxb-') else 'INVALID')
+    logger.info("✅ Signing secret length: %d (%s)", len(SLACK_SIGNING_SECRET), 'Valid' if len(SLACK_SIGNING_SECRET) == 32 else 'Check length')
+    logger.info("🛡️  Deduplication: Event + Response")
+    logger.info("🗄️  Event dedup store: %s (%d workers)", 'Redis' if REDIS_URL else 'in-process', BOT_WORKERS)
     
     uvicorn.run(
-        app,
+        "bot:app",
         host="0.0.0.0",
         port=3002,
         reload=False,
-        workers=1,
-        access_log=True
+        workers=BOT_WORKERS,
+        loop="uvloop",
+        http="httptools",
+        access_log=False
     )
\ No newline at end of file
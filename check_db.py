@@ -7,34 +7,42 @@ def check_database(db_path, table_name):
         print(f"Database file not found: {db_path}")
         return
     
+    conn = None
     try:
         conn = sqlite3.connect(db_path)
+        # Read-only inspection: a larger page cache and mmap'd reads cut syscalls
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA mmap_size=268435456")
         cursor = conn.cursor()
         
-        # Get table schema
-        cursor.execute(f"SELECT sql FROM sqlite_master WHERE type='table' AND name='{table_name}'")
+        # Get table schema; this also validates the table name before it is
+        # used as an identifier below
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
         schema = cursor.fetchone()
-        if schema:
-            print(f"\nSchema for {table_name}:")
-            print(schema[0])
+        if not schema:
+            print(f"\nTable not found: {table_name}")
+            return
+        print(f"\nSchema for {table_name}:")
+        print(schema[0])
+        
+        # Table names can't be bound as parameters, so quote the identifier
+        quoted = '"' + table_name.replace('"', '""') + '"'
         
         # Get row count
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+        cursor.execute(f"SELECT COUNT(*) FROM {quoted}")
         count = cursor.fetchone()[0]
         print(f"\nNumber of rows in {table_name}: {count}")
         
-        # Get all rows
-        cursor.execute(f"SELECT * FROM {table_name}")
-        rows = cursor.fetchall()
-        
-        if rows:
+        if count:
             print(f"\nContents of {table_name}:")
+            # Stream rows from the cursor instead of loading the table with fetchall()
+            cursor.execute(f"SELECT * FROM {quoted}")
             # Get column names
             columns = [description[0] for description in cursor.description]
             print("Columns:", columns)
             
             # Print each row
-            for row in rows:
+            for row in cursor:
                 print("\nRow:", row)
         else:
             print(f"\nNo data found in {table_name}")